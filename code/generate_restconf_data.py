@@ -5,8 +5,9 @@ and verify the generated message-body matches the test data.
 """
 # pylint: disable=unused-import
 import json
+import os
 import sys
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 from interface_models import InterfaceData
 
 # Define filenames to import
@@ -15,6 +16,9 @@ from interface_models import InterfaceData
 TEMPLATE_DIR = "templates/"
 TEMPLATE_FILE = "interface_yang_patch.j2"
 
+# Directory for compiled template bytecode, reused between runs:
+TEMPLATE_CACHE_DIR = ".jinja_cache"
+
 # Sample webhook data from ITSM:
 SAMPLE_DATA_FILE = "sample_webhook_data/ticket_trunk_interface.json"
 
@@ -22,10 +26,12 @@ SAMPLE_DATA_FILE = "sample_webhook_data/ticket_trunk_interface.json"
 SAMPLE_TEST_DATA_FILE = "test_data/expected_trunk_interface.json"
 
 # Prepare the Jinaj2 environment and load the template:
+os.makedirs(TEMPLATE_CACHE_DIR, exist_ok=True)
 template_env = Environment(loader=FileSystemLoader(TEMPLATE_DIR),
                            lstrip_blocks=True,
-                           trim_blocks=True)
+                           trim_blocks=True,
+                           auto_reload=False,
+                           bytecode_cache=FileSystemBytecodeCache(TEMPLATE_CACHE_DIR))
 interface_template = template_env.get_template(TEMPLATE_FILE)
-print()
 
 # Load the sample webhook data and the expected output:
@@ -13,11 +13,12 @@ from pydantic import BaseModel, model_validator, Field, field_validator
 # Example input: GigabitEthernet1/0/3
 # Match group 1: GigabitEthernet
 # Match group 2: 1/0/3
-INTERFACE_REGEX = re.compile(r"(\D+)(.*)")
+INTERFACE_REGEX = re.compile(r"(\D+)(.*)", re.ASCII)
 
-# Regular expression for interface name from YANG model
+# Regular expression for interface name from YANG model, anchored so the
+# entire name must match
 # Example valid matches:
 # 1/0/3
 # 25.2
 # 1/0/3.100
-YANG_REGEX = re.compile(r'(0|[1-9][0-9]*)(/(0|[1-9][0-9]*))*(\.[0-9]*)?')
+YANG_REGEX = re.compile(r'\A(0|[1-9]\d*)(/(0|[1-9]\d*))*(\.\d+)?\Z', re.ASCII)
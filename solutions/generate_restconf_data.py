@@ -1,47 +1,44 @@
 """
-Generate a YANG Patch message-body from a Jinja2 template after data has
-been validated by the Pydantic InterfaceData model, then load expected output
-and verify the generated message-body matches the test data.
+Generate a YANG Patch message-body directly from the Pydantic InterfaceData
+model after the data has been validated, then load expected output and verify
+the generated message-body matches the test data.
 """
-import json
+import logging
 import sys
-from jinja2 import Environment, FileSystemLoader
-from interface_models import InterfaceData
+import orjson
+from interface_models import InterfaceData, remove_unset_fields
+
+log = logging.getLogger(__name__)
 
 # Define filenames to import
 #
-# Jinja2 path and template name for YANG Patch message-body:
-TEMPLATE_DIR = "templates/"
-TEMPLATE_FILE = "interface_yang_patch.j2"
-
 # Sample webhook data from ITSM:
 SAMPLE_DATA_FILE = "sample_webhook_data/ticket_trunk_interface.json"
 
 # Validated message-body for generated output comparison:
 SAMPLE_TEST_DATA_FILE = "test_data/expected_trunk_interface.json"
 
-# Prepare the Jinaj2 environment and load the template:
-template_env = Environment(loader=FileSystemLoader(TEMPLATE_DIR),
-                           lstrip_blocks=True,
-                           trim_blocks=True)
-interface_template = template_env.get_template(TEMPLATE_FILE)
-print()
+# Diagnostics are logged at INFO, so they are silent by default:
+logging.basicConfig(level=logging.WARNING)
 
 # Load the sample webhook data and the expected output:
+log.info("Loading sample webhook data file '%s'...", SAMPLE_DATA_FILE)
 try:
-    with open(SAMPLE_DATA_FILE, "r", encoding="utf-8") as sample_data:
-        input_data = json.load(sample_data)
+    with open(SAMPLE_DATA_FILE, "rb") as sample_data:
+        input_data = orjson.loads(sample_data.read())
 except FileNotFoundError as err:
     sys.exit(f"Unable to open sample webhook data file '{SAMPLE_DATA_FILE}': {err}")
 
-validated_data = InterfaceData.model_validate(input_data["ticket"])
+ticket_data = remove_unset_fields(input_data["ticket"])
+validated_data = InterfaceData.model_validate(ticket_data)
 
-output_data = json.loads(interface_template.render(validated_data))
+output_data = validated_data.to_yang_patch()
 print(output_data)
 
+log.info("Loading expected output test data '%s'...", SAMPLE_TEST_DATA_FILE)
 try:
-    with open(SAMPLE_TEST_DATA_FILE, "r", encoding="utf-8") as sample_test_data:
-        test_data = json.load(sample_test_data)
+    with open(SAMPLE_TEST_DATA_FILE, "rb") as sample_test_data:
+        test_data = orjson.loads(sample_test_data.read())
 except FileNotFoundError as err:
     sys.exit(f"Unable to open expected output test data '{SAMPLE_TEST_DATA_FILE}': {err}")
 
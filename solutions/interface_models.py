@@ -4,8 +4,10 @@ Interface data model definitions
 # pylint: disable=unused-import, line-too-long, raise-missing-from
 from ipaddress import IPv4Interface
 import re
+import socket
+import struct
 from typing import Optional
-from pydantic import BaseModel, model_validator, Field, field_validator
+from pydantic import BaseModel, ConfigDict, model_validator, Field, field_validator
 
 
 # Regular expression to split interface type and ID.
@@ -13,27 +15,148 @@ from pydantic import BaseModel, model_validator, Field, field_validator
 # Example input: GigabitEthernet1/0/3
 # Match group 1: GigabitEthernet
 # Match group 2: 1/0/3
-INTERFACE_REGEX = re.compile(r"(\D+)(.*)")
+INTERFACE_REGEX = re.compile(r"(\D+)(.*)", re.ASCII)
 
-# Regular expression for interface name from YANG model
+# Regular expression for interface name from YANG model, anchored so the
+# entire name must match
 # Example valid matches:
 # 1/0/3
 # 25.2
 # 1/0/3.100
-YANG_REGEX = re.compile(r'(0|[1-9][0-9]*)(/(0|[1-9][0-9]*))*(\.[0-9]*)?')
+YANG_REGEX = re.compile(r'\A(0|[1-9]\d*)(/(0|[1-9]\d*))*(\.\d+)?\Z', re.ASCII)
+_YANG_FULLMATCH = YANG_REGEX.fullmatch
+
+# Translation table to normalize allowed VLAN range delimiters so the list
+# can be split on commas alone.
+#
+# Example input: 200,300-400
+# Translated: 200,300,400
+_VLAN_DELIM_TRANS = str.maketrans("-", ",")
+
+# Ticket fields the ITSM webhook sends as an empty string when unset
+UNSET_TICKET_FIELDS = frozenset({"network_interface_mtu",
+                                 "network_interface_description",
+                                 "network_interface_ip4_address"})
+
+
+def remove_unset_fields(ticket):
+    """
+    Drop the ticket fields the webhook sent as empty strings, so the model
+    defaults are applied. Call this once when the ticket is loaded, before
+    passing it to a model. The input ticket is not modified.
+
+    :param ticket: Ticket data dict from the webhook
+    :return: Copy of the ticket data without empty unset fields
+    """
+    ticket = dict(ticket)
+    for key in UNSET_TICKET_FIELDS & ticket.keys():
+        if ticket[key] == "":
+            del ticket[key]
+    return ticket
+
+
+def split_interface_name(network_interface_name):
+    """
+    Split an interface name at the first digit into the interface type and
+    the interface ID with INTERFACE_REGEX.
+
+    Example: GigabitEthernet1/0/3 -> ("GigabitEthernet", "1/0/3")
+
+    :param network_interface_name: Interface name from the ticket
+    :raises: ValueError if the name is missing, not a string, or has no type
+             prefix
+    :return: Tuple of (interface type, interface name)
+    """
+    if not isinstance(network_interface_name, str):
+        raise ValueError("Unable to extract the interface type and name from the ticket.")
+
+    interface_match = INTERFACE_REGEX.match(network_interface_name)
+    if interface_match is None:
+        raise ValueError("Unable to extract the interface type and name from the ticket.")
+
+    return interface_match.groups()
+
+
+def _set_l3_details(_data, _switchport_mode, _primary_vlan, _allowed_vlans):
+    """
+    Layer 3 ports have no switchport mode or VLANs.
+
+    :return: None, to clear the switchport mode
+    """
+    return None
+
+
+def _set_access_details(data, switchport_mode, primary_vlan, extra_field):
+    """
+    Set the access VLAN from the field following the switchport mode.
+
+    :param data: Input data dict passed to the Pydantic model
+    :param switchport_mode: Switchport mode from the ticket
+    :param primary_vlan: Access VLAN, or an empty string or None if unset
+    :param extra_field: Field after the access VLAN, which must be empty or None
+    :raises: ValueError if a field follows the access VLAN
+    :return: Lowercase switchport mode to set on the model
+    """
+    if extra_field:
+        raise ValueError(f"Unexpected field after the access VLAN: '{extra_field}'")
+    if primary_vlan == "":
+        primary_vlan = None
+    data.update({"switchport_native_vlan": primary_vlan})
+    return switchport_mode.lower()
+
+
+def _set_trunk_details(data, switchport_mode, native_vlan, allowed_vlans):
+    """
+    Set the native VLAN and allowed VLAN list from the fields following the
+    switchport mode.
+
+    :param data: Input data dict passed to the Pydantic model
+    :param switchport_mode: Switchport mode from the ticket
+    :param native_vlan: Native VLAN, or an empty string if unset
+    :param allowed_vlans: Allowed VLAN list, or an empty string if unset
+    :raises: ValueError if the native VLAN or allowed VLAN field is missing
+    :return: Lowercase switchport mode to set on the model
+    """
+    if allowed_vlans is None:
+        raise ValueError("Trunk ports need native VLAN and allowed VLAN fields, e.g. 'trunk:100:200,300'")
+    if native_vlan == "":
+        native_vlan = None
+    data.update({"switchport_native_vlan": native_vlan,
+                 "switchport_allowed_vlans": allowed_vlans})
+    return switchport_mode.lower()
+
+
+# Handlers for each (lowercase) switchport mode in the ticket, which update
+# the input data and return the switchport mode to set on the model
+SWITCHPORT_MODE_HANDLERS = {
+    "l3": _set_l3_details,
+    "access": _set_access_details,
+    "trunk": _set_trunk_details
+}
 
 
 class InterfaceData(BaseModel):
     """
-    Interface model to set needed fields for Jinja2-generated RESTCONF
-    message-body
+    Interface model to set needed fields for the RESTCONF YANG Patch
+    message-body built by to_yang_patch()
+
+    The ITSM webhook sends unset fields as empty strings, which the model
+    does not accept. Pass the ticket through remove_unset_fields() before
+    model_validate().
     """
+    # Instances are frozen, and ticket fields not defined on the model are
+    # ignored.
+    model_config = ConfigDict(extra="ignore",
+                              revalidate_instances="never",
+                              frozen=True)
+
     interface_type: str
     interface_name: str
     interface_enabled: bool = Field(validation_alias="network_interface_enabled")
     interface_description: Optional[str] = Field(validation_alias="network_interface_description",
                                                  min_length=0,
-                                                 max_length=200)
+                                                 max_length=200,
+                                                 default=None)
     interface_mtu: int = Field(validation_alias="network_interface_mtu",
                                ge=1500,
                                le=9000,
@@ -53,30 +176,13 @@ class InterfaceData(BaseModel):
           }
 
         :param data: Input data dict passed to the Pydantic model
-        :return: Input data updated with the parsed dictionary
-        """
-        try:
-            interface_type, interface_name = INTERFACE_REGEX.match(data["network_interface_name"]).groups()
-        except Exception:
-            raise ValueError("Unable to extract the interface type and name from the ticket.")
-
-        data.update({"interface_type": interface_type,
-                     "interface_name": interface_name})
-        return data
-
-    @model_validator(mode="before")
-    @classmethod
-    def remove_unset_mtu(cls, data):
+        :return: Copy of the input data updated with the parsed dictionary
         """
-        If the network_interface_mtu field is an empty string on input, delete
-        the key from the input data so the default value is applied.
+        interface_type, interface_name = split_interface_name(data.get("network_interface_name", ""))
 
-        :param data: Input data dict passed to the Pydantic model
-        :return: Input data with network_interface_mtu deleted if empty string
-        """
-        if data.get("network_interface_mtu", "") == "":
-            del data["network_interface_mtu"]
-        return data
+        return {**data,
+                "interface_type": interface_type,
+                "interface_name": interface_name}
 
     @field_validator("interface_name")
     @classmethod
@@ -89,23 +195,79 @@ class InterfaceData(BaseModel):
         :raises: ValueError is the name is invalid
         :return: Validated field value
         """
-        if not YANG_REGEX.match(v):
+        if not _YANG_FULLMATCH(v):
             raise ValueError(f"Invalid name for interface: '{v}'")
         return v
 
-    @field_validator("interface_description")
-    @classmethod
-    def empty_str_to_none(cls, v):
+    @property
+    def interface_target(self):
+        """
+        YANG Patch target path for the interface, with the "/" characters in
+        the interface name percent-encoded.
+
+        Example: /interface/GigabitEthernet=1%2F0%2F3
+
+        :return: Target path string
         """
-        If the interface description field is an empty string, set the value
-        to None. Otherwise, keep the description as-is.
+        return f"/interface/{self.interface_type}={self.interface_name.replace('/', '%2F')}"
 
-        :param v: Value of the field being validated (interface_description)
-        :return: None is input is an empty string, value otherwise
+    # NOTE: yang_patch_edits() here and in InterfacePortConfig mirror the
+    # templates in templates/interface_yang_patch.j2 and templates/patches/,
+    # which the code/ workshop scripts still render. Keep them in sync.
+    def yang_patch_edits(self):
         """
-        if v == "":
-            return None
-        return v
+        Build the list of YANG Patch edits for the interface description,
+        state, and MTU.
+
+        :return: List of YANG Patch edit dicts
+        """
+        target = self.interface_target
+
+        description_edit = {
+            "edit-id": "interface_description",
+            "operation": "merge" if self.interface_description else "remove",
+            "target": f"{target}/description"
+        }
+        if self.interface_description:
+            description_edit["value"] = {
+                "Cisco-IOS-XE-native:description": self.interface_description
+            }
+
+        state_edit = {
+            "edit-id": "interface_state",
+            "operation": "merge" if not self.interface_enabled else "remove",
+            "target": f"{target}/shutdown"
+        }
+        if not self.interface_enabled:
+            state_edit["value"] = {
+                "Cisco-IOS-XE-native:shutdown": ""
+            }
+
+        mtu_edit = {
+            "edit-id": "interface_mtu",
+            "operation": "merge",
+            "target": f"{target}/mtu",
+            "value": {
+                "Cisco-IOS-XE-native:mtu": self.interface_mtu
+            }
+        }
+
+        return [description_edit, state_edit, mtu_edit]
+
+    def to_yang_patch(self):
+        """
+        Build the YANG Patch message-body for the interface. This produces the
+        same structure as the interface_yang_patch.j2 template without
+        rendering and re-parsing JSON text.
+
+        :return: YANG Patch message-body as a Python dict
+        """
+        return {
+            "ietf-yang-patch:yang-patch": {
+                "patch-id": "update_interface_settings",
+                "edit": self.yang_patch_edits()
+            }
+        }
 
 
 class InterfacePortConfig(InterfaceData):
@@ -115,8 +277,8 @@ class InterfacePortConfig(InterfaceData):
     switchport_mode: Optional[str] = None
     switchport_native_vlan: Optional[int] = None
     switchport_allowed_vlans: Optional[str] = None
-    interface_ip4_address: Optional[IPv4Interface] = Field(validation_alias="network_interface_ip4_address",
-                                                           default=None)
+    interface_ip4_address: Optional[str] = Field(validation_alias="network_interface_ip4_address",
+                                                 default=None)
 
     @model_validator(mode="before")
     @classmethod
@@ -146,42 +308,26 @@ class InterfacePortConfig(InterfaceData):
                }
 
         :param data: Input data dict passed to the Pydantic model
-        :return: Input data updated with the parsed dictionary
+        :raises: ValueError if the switchport mode is not supported
+        :return: Copy of the input data updated with the parsed dictionary
         """
-        switchport_mode, primary_vlan = data["network_switchport_mode_and_vlan"].split(":", 1)
-        if switchport_mode.lower() == "l3":
-            switchport_mode = None
+        # Copy the input so the caller's data is not modified
+        data = dict(data)
 
-        elif switchport_mode.lower() == "access":
-            if primary_vlan == "":
-                primary_vlan = None
-            data.update({"switchport_native_vlan": primary_vlan})
+        # Split all fields in one pass, padding missing fields with None so
+        # the mode handlers can tell a missing field from an empty one
+        switchport_fields = data["network_switchport_mode_and_vlan"].split(":", 2)
+        switchport_fields += [None] * (3 - len(switchport_fields))
+        switchport_mode, primary_vlan, allowed_vlans = switchport_fields
 
-        elif switchport_mode.lower() == "trunk":
-            native_vlan, allowed_vlans = primary_vlan.split(":")
-            if native_vlan == "":
-                native_vlan = None
-            data.update({"switchport_native_vlan": native_vlan,
-                         "switchport_allowed_vlans": allowed_vlans})
+        mode_handler = SWITCHPORT_MODE_HANDLERS.get(switchport_mode.lower())
+        if mode_handler is None:
+            raise ValueError(f"Unsupported switchport mode: '{switchport_mode}'")
+        switchport_mode = mode_handler(data, switchport_mode, primary_vlan, allowed_vlans)
 
         data.update({"switchport_mode": switchport_mode})
         return data
 
-    @model_validator(mode="before")
-    @classmethod
-    def remove_unset_ip4_addr(cls, data):
-        """
-        If the input field "network_interface_ip4_address" is an empty string,
-        delete the key from the input before further model processing to allow
-        the default to be applied.
-
-        :param data: Input data dict passed to the Pydantic model
-        :return: Input data updated with the parsed dictionary
-        """
-        if data.get("network_interface_ip4_address", "") == "":
-            del data["network_interface_ip4_address"]
-        return data
-
     @field_validator("switchport_native_vlan")
     @classmethod
     def validate_native_vlan(cls, v):
@@ -212,7 +358,176 @@ class InterfacePortConfig(InterfaceData):
             v = None
         else:
             v = v.replace(" ", "")  # Remove any whitespace from allowed vlans
-            for vlan in re.split(r",|-", v):
+            for vlan in v.translate(_VLAN_DELIM_TRANS).split(","):
                 if not 1 <= int(vlan) <= 4094:
                     raise ValueError(f"VLAN '{vlan}' error: must be in the range 1-4094")
         return v
+
+    @field_validator("interface_ip4_address")
+    @classmethod
+    def validate_ip4_address(cls, v):
+        """
+        Test that the field is a dotted-quad IPv4 address with an optional
+        prefix length (default /32) in the range 0..32. A netmask or hostmask
+        after the "/" is converted to a prefix length with IPv4Interface.
+
+        Examples: 192.168.10.10/24, 192.168.10.10/255.255.255.0
+
+        :param v: Value of the field being validated (interface_ip4_address)
+        :raises: ValueError if the address or prefix length is invalid
+        :return: Address in "address/prefix length" form
+        """
+        if v is None:
+            return v
+
+        address, _, prefix_length = v.partition("/")
+        try:
+            socket.inet_pton(socket.AF_INET, address)
+        except OSError:
+            raise ValueError(f"Invalid IPv4 address: '{v}'")
+
+        if prefix_length == "":
+            prefix_length = "32"
+        if not (prefix_length.isascii() and prefix_length.isdigit()):
+            # Netmask or hostmask form, e.g. 10.0.0.1/255.0.0.0
+            try:
+                return IPv4Interface(v).with_prefixlen
+            except ValueError:
+                raise ValueError(f"Invalid IPv4 prefix length: '{v}'")
+        if int(prefix_length) > 32:
+            raise ValueError(f"Invalid IPv4 prefix length: '{v}'")
+        return f"{address}/{int(prefix_length)}"
+
+    @property
+    def interface_ip4_netmask(self):
+        """
+        Dotted-quad netmask for the prefix length of interface_ip4_address.
+
+        Example: 192.168.10.10/24 -> 255.255.255.0
+
+        :return: Netmask string, or None if no address is set
+        """
+        if not self.interface_ip4_address:
+            return None
+        prefix_length = int(self.interface_ip4_address.partition("/")[2])
+        return socket.inet_ntoa(struct.pack(">I", (0xFFFFFFFF << (32 - prefix_length)) & 0xFFFFFFFF))
+
+    def yang_patch_edits(self):
+        """
+        Extend the base interface edits with the layer 2 switchport or layer 3
+        routed port edits, depending on the switchport mode.
+
+        :return: List of YANG Patch edit dicts
+        """
+        # Mirrors templates/patches/l2_interface.j2 and l3_interface.j2
+        edits = super().yang_patch_edits()
+        target = self.interface_target
+
+        if not self.switchport_mode:
+            edits.extend([
+                {
+                    "edit-id": "switchport_bool",
+                    "operation": "merge",
+                    "target": f"{target}/switchport-conf/switchport",
+                    "value": {
+                        "Cisco-IOS-XE-native:switchport": False
+                    }
+                },
+                {
+                    "edit-id": "remove_switchport_config",
+                    "operation": "remove",
+                    "target": f"{target}/switchport-config/switchport"
+                }
+            ])
+            if self.interface_ip4_address:
+                edits.append({
+                    "edit-id": "set_ip4_address",
+                    "operation": "merge",
+                    "target": f"{target}/ip",
+                    "value": {
+                        "Cisco-IOS-XE-native:ip": {
+                            "address": {
+                                "primary": {
+                                    "address": self.interface_ip4_address.partition("/")[0],
+                                    "mask": self.interface_ip4_netmask
+                                }
+                            }
+                        }
+                    }
+                })
+            return edits
+
+        edits.extend([
+            {
+                "edit-id": "remove_ip",
+                "operation": "remove",
+                "target": f"{target}/ip"
+            },
+            {
+                "edit-id": "is_switchport",
+                "operation": "merge",
+                "target": f"{target}/switchport-conf/switchport",
+                "value": {
+                    "Cisco-IOS-XE-native:switchport": True
+                }
+            },
+            {
+                "edit-id": "switchport_mode",
+                "operation": "merge",
+                "target": f"{target}/switchport-config/switchport/mode",
+                "value": {
+                    "Cisco-IOS-XE-switch:mode": {
+                        self.switchport_mode: {}
+                    }
+                }
+            }
+        ])
+
+        if self.switchport_mode == "access":
+            edits.append({
+                "edit-id": "remove_unused_config",
+                "operation": "remove",
+                "target": f"{target}/switchport-config/switchport/trunk"
+            })
+            if self.switchport_native_vlan:
+                edits.append({
+                    "edit-id": "port_vlan",
+                    "operation": "merge",
+                    "target": f"{target}/switchport-config/switchport/access",
+                    "value": {
+                        "Cisco-IOS-XE-switch:access": {
+                            "vlan": {
+                                "vlan": self.switchport_native_vlan
+                            }
+                        }
+                    }
+                })
+
+        elif self.switchport_mode == "trunk":
+            edits.append({
+                "edit-id": "remove_unused_config",
+                "operation": "remove",
+                "target": f"{target}/switchport-config/switchport/access"
+            })
+            if self.switchport_native_vlan or self.switchport_allowed_vlans:
+                edits.append({
+                    "edit-id": "port_vlan",
+                    "operation": "merge",
+                    "target": f"{target}/switchport-config/switchport/trunk",
+                    "value": {
+                        "Cisco-IOS-XE-switch:trunk": {
+                            "native": {
+                                "vlan": {
+                                    "vlan-id": self.switchport_native_vlan
+                                }
+                            },
+                            "allowed": {
+                                "vlan": {
+                                    "vlans": self.switchport_allowed_vlans
+                                }
+                            }
+                        }
+                    }
+                })
+
+        return edits
@@ -2,7 +2,7 @@
 
 DEVWKS-2477 - Challenge test script. Load sample webhook data and the
 corresponding validated JSON test file. Parse the webhook data with
-the challenge Pydantic model, and print the rendered YANG Patch message-body
+the challenge Pydantic model, and print the generated YANG Patch message-body
 along with the result of comparing the webhook data to the test data.
 
 Copyright (c) 2023 Cisco and/or its affiliates.
@@ -26,19 +26,21 @@ __copyright__ = "Copyright (c) 2023 Cisco and/or its affiliates."
 __license__ = "Cisco Sample Code License, Version 1.1"
 
 import argparse
-import json
+import functools
+import logging
+import mmap
 import os
 import sys
-from jinja2 import Environment, FileSystemLoader
-from interface_models import InterfacePortConfig
+import orjson
+from interface_models import InterfacePortConfig, remove_unset_fields
 
+log = logging.getLogger(__name__)
 
-# Set paths for the script, data files, and templates
+
+# Set paths for the script and data files
 SCRIPT_BASEPATH = os.path.dirname(os.path.abspath(__file__))
 SAMPLE_DATA_PATH = os.path.join(SCRIPT_BASEPATH, "sample_webhook_data")
 TEST_DATA_PATH = os.path.join(SCRIPT_BASEPATH, "test_data")
-TEMPLATE_PATH = os.path.join(SCRIPT_BASEPATH, "templates")
-TEMPLATE_FILE = "interface_yang_patch.j2"
 
 
 # Set the sample data and test files based on the test name
@@ -57,62 +59,71 @@ DATA_FILES = {
     }
 }
 
-template_env = Environment(loader=FileSystemLoader(TEMPLATE_PATH),
-                           lstrip_blocks=True,
-                           trim_blocks=True)
-RESTCONF_TEMPLATE = template_env.get_template(TEMPLATE_FILE)
+
+@functools.lru_cache(maxsize=32)
+def _load_json_cached(source_file, _mtime_ns):
+    """
+    Parse a JSON source file, memoized by path and modification time so a
+    changed file is read again. The file is memory-mapped and parsed in
+    place rather than read into a buffer first.
+
+    :param source_file: Full path of the file to load
+    :param _mtime_ns: Modification time of the file, used as part of the cache key
+    :return: Deserialized JSON data as a Python object
+    """
+    with open(source_file, "rb") as infile:
+        with mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+            with memoryview(mapped_file) as file_view:
+                return orjson.loads(file_view)
 
 
 def load_json_file(file_path, file_name):
     """
-    Load a JSON source file and return the Python object.
+    Load a JSON source file and return the Python object. Repeated loads of
+    an unchanged file return the same cached object, so callers must not
+    modify it.
 
     :param file_path: Path of the file to load
     :param file_name: Filename to load
     :return: Deserialized JSON data as a Python object
     """
-    print(f"Loading JSON file '{os.path.join(file_path, file_name)}'...")
+    source_file = os.path.join(file_path, file_name)
+    log.info("Loading JSON file '%s'...", source_file)
     try:
-        with open(os.path.join(file_path, file_name), "r", encoding="utf-8") as infile:
-            source_data = json.load(infile)
+        source_data = _load_json_cached(source_file, os.stat(source_file).st_mtime_ns)
     except FileNotFoundError as err:
-        sys.exit(f"Unable to open source file '{os.path.join(file_path, file_name)}': {err}'")
+        sys.exit(f"Unable to open source file '{source_file}': {err}'")
+    except ValueError as err:
+        sys.exit(f"Unable to load JSON from source file '{source_file}': {err}")
 
     return source_data
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
-    group = parser.add_mutually_exclusive_group(required=True)
-    group.add_argument("-a", "--access",
-                        help="Access port tests",
-                        action="store_const",
-                        dest="test_name",
-                        const="access")
-    group.add_argument("-t", "--trunk",
-                        help="Trunk port tests",
-                        action="store_const",
-                        dest="test_name",
-                        const="trunk")
-    group.add_argument("-l", "--layer3",
-                        help="Layer 3 port tests",
-                        action="store_const",
-                        dest="test_name",
-                        const="l3")
+    parser.add_argument("-m", "--mode",
+                        help="Port tests to run: access, trunk, or l3 (layer 3)",
+                        choices=tuple(DATA_FILES),
+                        required=True,
+                        dest="test_name")
     args, _ = parser.parse_known_args()
 
+    # Diagnostics are logged at INFO, so they are silent by default
+    logging.basicConfig(level=logging.WARNING)
+
     # Load the source data files
     webhook_data = load_json_file(SAMPLE_DATA_PATH, DATA_FILES[args.test_name]["sample_data"])
     test_data = load_json_file(TEST_DATA_PATH, DATA_FILES[args.test_name]["test_data"])
 
-    # Validate the input and render the message-body
-    validated_data = InterfacePortConfig.model_validate(webhook_data["ticket"])
-    message_body = json.loads(RESTCONF_TEMPLATE.render(validated_data))
+    # Validate the input and build the message-body
+    ticket_data = remove_unset_fields(webhook_data["ticket"])
+    validated_data = InterfacePortConfig.model_validate(ticket_data)
+    message_body = validated_data.to_yang_patch()
 
     print("Pydantic model output:\n")
-    print(validated_data.model_dump_json(indent=2))
-    print("\nYANG Patch message-body from template:\n")
-    print(json.dumps(message_body, indent=2))
+    print(orjson.dumps(validated_data.model_dump(), option=orjson.OPT_INDENT_2).decode())
+    print("\nYANG Patch message-body from model:\n")
+    print(orjson.dumps(message_body, option=orjson.OPT_INDENT_2).decode())
 
     if message_body == test_data:
         print("\nOK! Output data matches the tested YANG Patch message-body!")